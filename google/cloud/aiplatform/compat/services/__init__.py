@@ -42,6 +42,9 @@ from google.cloud.aiplatform_v1beta1.services.metadata_service import (
 from google.cloud.aiplatform_v1beta1.services.tensorboard_service import (
     client as tensorboard_service_client_v1beta1,
 )
+from google.cloud.aiplatform_v1beta1.services.tensorboard_service import (
+    async_client as tensorboard_service_async_client_v1beta1,
+)
 
 from google.cloud.aiplatform_v1.services.dataset_service import (
     client as dataset_service_client_v1,
@@ -84,4 +87,5 @@ __all__ = (
     specialist_pool_service_client_v1beta1,
     metadata_service_client_v1beta1,
     tensorboard_service_client_v1beta1,
+    tensorboard_service_async_client_v1beta1,
 )
@@ -30,7 +30,6 @@ from typing import (
     Tuple,
 )
 
-import grpc
 from tensorboard.uploader import upload_tracker
 from tensorboard.uploader import util
 from tensorboard.uploader.proto import server_info_pb2
@@ -202,7 +201,8 @@ class ProfileRequestSender(uploader_utils.RequestSender):
             event_time = datetime.datetime.strptime(prof_session, "%Y_%m_%d_%H_%M_%S")
             event_timestamp = timestamp.Timestamp().FromDatetime(event_time)
 
-            # Implicit flush to any files after they are uploaded.
+            # Uploads the files now; their blob ids are written by
+            # flush_writes() below.
             self._run_to_file_request_sender[run_name].add_files(
                 files=files,
                 tag=prof_session,
@@ -210,6 +210,10 @@ class ProfileRequestSender(uploader_utils.RequestSender):
                 event_timestamp=event_timestamp,
             )
 
+        # Write the blob ids of all new profile sessions in as few requests
+        # as possible.
+        self._run_to_file_request_sender[run_name].flush_writes()
+
 
 class _ProfileSessionLoader(object):
     """Loader for a profile session within a training run.
@@ -365,6 +369,14 @@ class _FileRequestSender(object):
         self._time_series_resource_manager = uploader_utils.TimeSeriesResourceManager(
             run_resource_id, api
         )
+        # Blob uploads take far longer than the default batching delay, and
+        # ProfileRequestSender flushes once per run, so batch by size only.
+        self._writer = uploader_utils.BatchingWriter(
+            api=api,
+            run_resource_name=run_resource_id,
+            max_request_size=max_blob_request_size,
+            max_delay_secs=None,
+        )
 
         self._bucket = blob_storage_bucket
         self._folder = blob_storage_folder
@@ -390,9 +402,8 @@ class _FileRequestSender(object):
 
         If a file does not exist, the file is ignored and the rest of the
         files are checked to ensure the remaining files exist. After checking
-        the files, an rpc is immediately sent.
-
-        Files are flushed immediately, opposed to some of the other request senders.
+        the files, they are uploaded immediately and their blob ids are queued
+        for writing to the time series; call `flush_writes()` to send them.
 
         Args:
             files (List[str]):
@@ -478,14 +489,11 @@ class _FileRequestSender(object):
         if not request.time_series_data:
             return
 
-        with uploader_utils.request_logger(request):
-            try:
-                self._api.write_tensorboard_run_data(
-                    tensorboard_run=self._run_resource_id,
-                    time_series_data=request.time_series_data,
-                )
-            except grpc.RpcError as e:
-                logger.error("Upload call failed with error %s", e)
+        self._writer.add(request)
+
+    def flush_writes(self):
+        """Sends the time series data queued by `add_files(...)`."""
+        self._writer.flush()
 
     def _file_too_large(self, filename: str) -> bool:
         """Determines if a file is too large to upload.
@@ -16,18 +16,28 @@
 #
 
 """Shared utils for tensorboard log uploader."""
-import abc
+import asyncio
+import collections
+from concurrent import futures
 import contextlib
+import copy
+import functools
+import itertools
 import json
 import logging
 import re
+import threading
 import time
-from typing import Callable, Dict, Generator, Optional
+from typing import Callable, Dict, Generator, Iterable, List, Optional, Set, Tuple
 import uuid
 
+from requests import adapters
 from tensorboard.util import tb_logging
+from urllib3.util import retry
 
 from google.api_core import exceptions
+from google.api_core import gapic_v1
+from google.auth import credentials as auth_credentials
 from google.cloud import storage
 from google.cloud.aiplatform.compat.types import (
     tensorboard_run_v1beta1 as tensorboard_run,
@@ -38,34 +48,226 @@ from google.cloud.aiplatform.compat.types import (
 from google.cloud.aiplatform.compat.types import (
     tensorboard_time_series_v1beta1 as tensorboard_time_series,
 )
+from google.cloud.aiplatform.compat.services import (
+    tensorboard_service_async_client_v1beta1,
+)
 from google.cloud.aiplatform.compat.services import tensorboard_service_client_v1beta1
 from google.cloud.aiplatform_v1beta1.types import TensorboardRun
 
+# Prefer make_tensorboard_client() for constructing clients used by the
+# uploader, as it tunes the gRPC channel for many concurrent calls.
 TensorboardServiceClient = tensorboard_service_client_v1beta1.TensorboardServiceClient
+TensorboardServiceAsyncClient = (
+    tensorboard_service_async_client_v1beta1.TensorboardServiceAsyncClient
+)
 
 logger = tb_logging.get_logger()
 logger.setLevel(logging.WARNING)
 
+# Maximum number of concurrent create-or-get RPCs issued by bulk lookups.
+_MAX_RESOURCE_WORKERS = 32
+
+# Failed time series lookups are remembered for this many seconds so repeated
+# requests for the same tag fail fast instead of repeating the RPCs.
+_NEGATIVE_CACHE_TTL_SECS = 30.0
+_NEGATIVE_CACHE_MAX_SIZE = 4096
+
+# Defaults for BatchingWriter; the size budget stays below the 4 MiB gRPC
+# message limit.
+_DEFAULT_MAX_BATCHED_WRITE_SIZE = int(3.5 * (2 ** 20))  # 3.5MiB
+_DEFAULT_MAX_BATCHED_WRITE_DELAY_SECS = 0.2
+
+# Channel options for make_tensorboard_client. Keepalive pings stop idle
+# connections from being dropped between upload cycles, so concurrent
+# create/list calls keep multiplexing over the same connection.
+_TENSORBOARD_CHANNEL_OPTIONS = (
+    ("grpc.max_send_message_length", -1),
+    ("grpc.max_receive_message_length", -1),
+    ("grpc.keepalive_time_ms", 30000),
+    ("grpc.keepalive_timeout_ms", 10000),
+    ("grpc.http2.max_pings_without_data", 0),
+)
+
+_GS_URI_RE = re.compile(r"^gs://([^/]+)")
+
+# Connection pool settings for the shared storage client's HTTP session.
+_STORAGE_POOL_CONNECTIONS = 32
+_STORAGE_POOL_MAXSIZE = 64
+
+_storage_client: Optional[storage.Client] = None
+_storage_client_lock = threading.Lock()
+
 
 class ExistingResourceNotFoundError(RuntimeError):
     """Resource could not be created or retrieved."""
 
 
+# Only failures that retrying cannot fix are remembered by the negative cache.
+# Transient errors such as ServiceUnavailable or DeadlineExceeded are retried,
+# as is ExistingResourceNotFoundError, which means the list call lagged behind
+# an "already exist" create.
+_NEGATIVE_CACHE_ERRORS = (
+    exceptions.InvalidArgument,
+    ValueError,
+)
+
+
+def make_tensorboard_client(
+    api_endpoint: str,
+    credentials: Optional[auth_credentials.Credentials] = None,
+    client_info: Optional[gapic_v1.client_info.ClientInfo] = None,
+) -> TensorboardServiceClient:
+    """Returns a TensorboardServiceClient on a keepalive-tuned gRPC channel.
+
+    Args:
+        api_endpoint (str):
+            Required. The regional API endpoint, e.g.
+            us-central1-aiplatform.googleapis.com
+        credentials (auth_credentials.Credentials):
+            Optional. Credentials for the channel. If not provided, they are
+            ascertained from the environment.
+        client_info (gapic_v1.client_info.ClientInfo):
+            Optional. Client info used to send a user-agent string.
+
+    Returns:
+        client (TensorboardServiceClient):
+            A client whose channel uses the tuned options.
+    """
+    transport_class = TensorboardServiceClient.get_transport_class("grpc")
+    channel = transport_class.create_channel(
+        api_endpoint,
+        credentials=credentials,
+        options=list(_TENSORBOARD_CHANNEL_OPTIONS),
+    )
+    transport_kwargs = {"host": api_endpoint, "channel": channel}
+    if client_info:
+        transport_kwargs["client_info"] = client_info
+    return TensorboardServiceClient(transport=transport_class(**transport_kwargs))
+
+
+@functools.lru_cache(maxsize=8192)
+def _display_name_filter(display_name: str) -> str:
+    """Returns a list filter matching resources with the given display name."""
+    return "display_name = " + json.dumps(display_name)
+
+
+def _list_time_series_by_display_name_request(
+    parent: str, display_name: str
+) -> tensorboard_service.ListTensorboardTimeSeriesRequest:
+    """Returns a request listing at most two time series with the display name.
+
+    Two results are enough to tell a unique match apart from a duplicate.
+
+    Args:
+        parent (str):
+            Required. The resource name of the run owning the time series.
+        display_name (str):
+            Required. The display name of the time series.
+
+    Returns:
+        request (tensorboard_service.ListTensorboardTimeSeriesRequest):
+            The list request.
+    """
+    return tensorboard_service.ListTensorboardTimeSeriesRequest(
+        parent=parent, filter=_display_name_filter(display_name), page_size=2,
+    )
+
+
+def _unique_time_series(
+    list_of_time_series: Iterable[tensorboard_time_series.TensorboardTimeSeries],
+    tag_name: str,
+) -> tensorboard_time_series.TensorboardTimeSeries:
+    """Returns the only time series listed for a display name.
+
+    At most two items are read from `list_of_time_series`.
+
+    Args:
+        list_of_time_series (Iterable[tensorboard_time_series.TensorboardTimeSeries]):
+            Required. Time series listed with a display name filter.
+        tag_name (str):
+            Required. The display name the time series were listed with.
+
+    Returns:
+        time_series (tensorboard_time_series.TensorboardTimeSeries):
+            The single time series with the display name.
+
+    Raises:
+        ExistingResourceNotFoundError:
+            Could not find the resource given the tag name.
+        ValueError:
+            More than one time series with the resource name was found.
+    """
+    results = list(itertools.islice(list_of_time_series, 2))
+
+    if not results:
+        raise ExistingResourceNotFoundError(
+            "Could not find time series resource with display name: {}".format(tag_name)
+        )
+
+    if len(results) > 1:
+        raise ValueError(
+            "More than one time series resource found with display_name: {}".format(
+                tag_name
+            )
+        )
+    return results[0]
+
+
+def _index_time_series_by_display_name(
+    list_of_time_series: Iterable[tensorboard_time_series.TensorboardTimeSeries],
+) -> Dict[str, tensorboard_time_series.TensorboardTimeSeries]:
+    """Maps display names to listed time series, leaving out duplicated names.
+
+    A display name shared by several time series is left out so that its tag
+    takes the create path, where _unique_time_series reports the duplicates.
+
+    Args:
+        list_of_time_series (Iterable[tensorboard_time_series.TensorboardTimeSeries]):
+            Required. Time series listed for a run.
+
+    Returns:
+        display_name_to_time_series (Dict[str, tensorboard_time_series.TensorboardTimeSeries]):
+            The time series whose display name is unique, keyed by display name.
+    """
+    display_name_to_time_series = {}
+    duplicated_display_names = set()
+    for time_series in list_of_time_series:
+        if time_series.display_name in display_name_to_time_series:
+            duplicated_display_names.add(time_series.display_name)
+        else:
+            display_name_to_time_series[time_series.display_name] = time_series
+    for display_name in duplicated_display_names:
+        del display_name_to_time_series[display_name]
+    return display_name_to_time_series
+
+
 class RequestSender(object):
     """A base class for additional request sender objects.
 
     Currently just used for typing.
     """
 
-    @abc.abstractmethod
-    def send_requests(run_name: str):
+    __slots__ = ()
+
+    def send_request(self, run_name: str) -> None:
         """Sends any request for the run."""
-        pass
+        raise NotImplementedError
 
 
 class OnePlatformResourceManager(object):
     """Helper class managing One Platform resources."""
 
+    __slots__ = (
+        "_experiment_resource_name",
+        "_api",
+        "_run_name_to_run_resource_name",
+        "_run_to_tag_to_time_series_name",
+        "_runs_prefetched",
+        "_time_series_prefetched_runs",
+        "_cache_lock",
+        "_time_series_failures",
+    )
+
     def __init__(self, experiment_resource_name: str, api: TensorboardServiceClient):
         """Constructor for OnePlatformResourceManager.
 
@@ -79,7 +281,16 @@ class OnePlatformResourceManager(object):
         self._experiment_resource_name = experiment_resource_name
         self._api = api
         self._run_name_to_run_resource_name: Dict[str, str] = {}
-        self._run_tag_name_to_time_series_name: Dict[(str, str), str] = {}
+        self._run_to_tag_to_time_series_name: Dict[str, Dict[str, str]] = {}
+        self._runs_prefetched = False
+        self._time_series_prefetched_runs: Set[str] = set()
+        self._cache_lock = threading.Lock()
+        # Maps (run_name, tag_name) to the time and exception of the last
+        # non-retryable failed lookup, ordered from least to most recently
+        # failed.
+        self._time_series_failures: Dict[
+            Tuple[str, str], Tuple[float, Exception]
+        ] = collections.OrderedDict()
 
     def get_run_resource_name(self, run_name: str) -> str:
         """
@@ -95,10 +306,76 @@ class OnePlatformResourceManager(object):
                 Resource name of the run.
         """
         if run_name not in self._run_name_to_run_resource_name:
-            tb_run = self._create_or_get_run_resource(run_name)
-            self._run_name_to_run_resource_name[run_name] = tb_run.name
+            self._prefetch_run_resource_names()
+        if run_name not in self._run_name_to_run_resource_name:
+            self._create_or_get_and_cache_run_resource_name(run_name)
         return self._run_name_to_run_resource_name[run_name]
 
+    def bulk_get_run_resource_names(self, run_names: Iterable[str]) -> Dict[str, str]:
+        """
+        Get the resource names of several runs, concurrently creating on One
+        Platform the ones that do not exist yet.
+
+        Args:
+            run_names (Iterable[str]):
+                Required. The names of the runs.
+
+        Returns:
+            run_resource_names (Dict[str, str]):
+                Mapping from run name to the resource name of the run.
+        """
+        run_names = list(dict.fromkeys(run_names))
+        if any(
+            run_name not in self._run_name_to_run_resource_name
+            for run_name in run_names
+        ):
+            self._prefetch_run_resource_names()
+        missing_run_names = [
+            run_name
+            for run_name in run_names
+            if run_name not in self._run_name_to_run_resource_name
+        ]
+        if missing_run_names:
+            with futures.ThreadPoolExecutor(
+                max_workers=min(_MAX_RESOURCE_WORKERS, len(missing_run_names))
+            ) as executor:
+                # list() re-raises the first exception from the workers.
+                list(
+                    executor.map(
+                        self._create_or_get_and_cache_run_resource_name,
+                        missing_run_names,
+                    )
+                )
+        return {
+            run_name: self._run_name_to_run_resource_name[run_name]
+            for run_name in run_names
+        }
+
+    def _create_or_get_and_cache_run_resource_name(self, run_name: str):
+        """Creates or retrieves the run and stores its resource name.
+
+        Args:
+            run_name (str):
+                Required. The name of the run.
+        """
+        tb_run = self._create_or_get_run_resource(run_name)
+        with self._cache_lock:
+            self._run_name_to_run_resource_name[run_name] = tb_run.name
+
+    def _prefetch_run_resource_names(self):
+        """Populates the run cache with every run already in the experiment.
+
+        Only the first call lists the runs; later calls are no-ops so that
+        lookups of new runs fall through to creation without extra RPCs.
+        """
+        if self._runs_prefetched:
+            return
+        for tb_run in self._api.list_tensorboard_runs(
+            parent=self._experiment_resource_name
+        ):
+            self._run_name_to_run_resource_name[tb_run.display_name] = tb_run.name
+        self._runs_prefetched = True
+
     def _create_or_get_run_resource(self, run_name: str) -> TensorboardRun:
         """Creates a new run resource in current tensorboard experiment resource.
 
@@ -122,25 +399,31 @@ class OnePlatformResourceManager(object):
             tb_run = self._api.create_tensorboard_run(
                 parent=self._experiment_resource_name,
                 tensorboard_run=tb_run,
-                tensorboard_run_id=str(uuid.uuid4()),
+                tensorboard_run_id=uuid.uuid4().hex,
             )
         except exceptions.InvalidArgument as e:
             # If the run name already exists then retrieve it
             if "already exist" in e.message:
                 runs_pages = self._api.list_tensorboard_runs(
-                    parent=self._experiment_resource_name
+                    request=tensorboard_service.ListTensorboardRunsRequest(
+                        parent=self._experiment_resource_name,
+                        filter=_display_name_filter(str(run_name)),
+                    )
                 )
-                for tb_run in runs_pages:
-                    if tb_run.display_name == run_name:
-                        break
+                tb_run = next(iter(runs_pages), None)
 
-                if tb_run.display_name != run_name:
+                if tb_run is None:
                     raise ExistingResourceNotFoundError(
                         "Run with name %s already exists but is not resource list."
                         % run_name
                     )
             else:
                 raise
+        else:
+            # A run created by this manager has no time series yet, so there
+            # is nothing to prefetch for it.
+            with self._cache_lock:
+                self._time_series_prefetched_runs.add(run_name)
         return tb_run
 
     def get_time_series_resource_name(
@@ -168,16 +451,163 @@ class OnePlatformResourceManager(object):
             time_series_name (str):
                 Resource name of the time series
         """
-        if (run_name, tag_name) not in self._run_tag_name_to_time_series_name:
+        tag_to_time_series_name = self._run_to_tag_to_time_series_name.setdefault(
+            run_name, {}
+        )
+        if tag_name not in tag_to_time_series_name:
+            run_resource_name = self.get_run_resource_name(run_name)
+            self._prefetch_time_series_resource_names(run_name, run_resource_name)
+            if tag_name not in tag_to_time_series_name:
+                self._create_or_get_and_cache_time_series_resource_name(
+                    run_name, run_resource_name, tag_name, time_series_resource_creator
+                )
+        return tag_to_time_series_name[tag_name]
+
+    def bulk_get_time_series_resource_names(
+        self,
+        run_name: str,
+        tag_creator_pairs: Iterable[
+            Tuple[str, Callable[[], tensorboard_time_series.TensorboardTimeSeries]]
+        ],
+    ) -> Dict[str, str]:
+        """
+        Get the resource names of several time series of a run, concurrently
+        creating on One Platform the ones that do not exist yet.
+
+        Args:
+            run_name (str):
+                Required. The name of the run.
+            tag_creator_pairs (Iterable[Tuple[str, Callable[[], tensorboard_time_series.TensorboardTimeSeries]]]):
+                Required. Pairs of tag name and a constructor used for creating
+                the time series on One Platform.
+
+        Returns:
+            time_series_names (Dict[str, str]):
+                Mapping from tag name to the resource name of the time series.
+        """
+        tag_creator_pairs: List[
+            Tuple[str, Callable[[], tensorboard_time_series.TensorboardTimeSeries]]
+        ] = list(dict(tag_creator_pairs).items())
+        run_resource_name = self.get_run_resource_name(run_name)
+        tag_to_time_series_name = self._run_to_tag_to_time_series_name.setdefault(
+            run_name, {}
+        )
+        if any(
+            tag_name not in tag_to_time_series_name for tag_name, _ in tag_creator_pairs
+        ):
+            self._prefetch_time_series_resource_names(run_name, run_resource_name)
+        missing_pairs = [
+            (tag_name, creator)
+            for tag_name, creator in tag_creator_pairs
+            if tag_name not in tag_to_time_series_name
+        ]
+        if missing_pairs:
+            with futures.ThreadPoolExecutor(
+                max_workers=min(_MAX_RESOURCE_WORKERS, len(missing_pairs))
+            ) as executor:
+                pending = [
+                    executor.submit(
+                        self._create_or_get_and_cache_time_series_resource_name,
+                        run_name,
+                        run_resource_name,
+                        tag_name,
+                        creator,
+                    )
+                    for tag_name, creator in missing_pairs
+                ]
+                for future in pending:
+                    future.result()
+        return {
+            tag_name: tag_to_time_series_name[tag_name]
+            for tag_name, _ in tag_creator_pairs
+        }
+
+    def _create_or_get_and_cache_time_series_resource_name(
+        self,
+        run_name: str,
+        run_resource_name: str,
+        tag_name: str,
+        time_series_resource_creator: Callable[
+            [], tensorboard_time_series.TensorboardTimeSeries
+        ],
+    ):
+        """Creates or retrieves the time series and stores its resource name.
+
+        A non-retryable failure is remembered for a short time and raised again
+        without calling the service if the same time series is requested again.
+
+        Args:
+            run_name (str):
+                Required. The name of the run.
+            run_resource_name (str):
+                Required. The resource name of the run.
+            tag_name (str):
+                Required. The name of the tag.
+            time_series_resource_creator (Callable[[], tensorboard_time_series.TensorboardTimeSeries]):
+                Required. A constructor used for creating the time series on One Platform.
+
+        Raises:
+            exceptions.GoogleAPICallError:
+                The time series could not be created or retrieved.
+            ExistingResourceNotFoundError:
+                Could not find the resource given the tag name.
+            ValueError:
+                More than one time series with the resource name was found.
+        """
+        key = (run_name, tag_name)
+        with self._cache_lock:
+            failure = self._time_series_failures.get(key)
+        if failure:
+            failure_time, error = failure
+            if time.monotonic() - failure_time < _NEGATIVE_CACHE_TTL_SECS:
+                # A copy per raise keeps errors, details and response but not
+                # the traceback, as callers may be on other threads.
+                raise copy.copy(error)
+
+        try:
             time_series = self._create_or_get_time_series(
-                self.get_run_resource_name(run_name),
-                tag_name,
-                time_series_resource_creator,
+                run_resource_name, tag_name, time_series_resource_creator,
             )
-            self._run_tag_name_to_time_series_name[
-                (run_name, tag_name)
+        except _NEGATIVE_CACHE_ERRORS as e:
+            with self._cache_lock:
+                self._time_series_failures[key] = (time.monotonic(), copy.copy(e))
+                self._time_series_failures.move_to_end(key)
+                if len(self._time_series_failures) > _NEGATIVE_CACHE_MAX_SIZE:
+                    self._time_series_failures.popitem(last=False)
+            raise
+
+        with self._cache_lock:
+            self._run_to_tag_to_time_series_name.setdefault(run_name, {})[
+                tag_name
             ] = time_series.name
-        return self._run_tag_name_to_time_series_name[(run_name, tag_name)]
+            self._time_series_failures.pop(key, None)
+
+    def _prefetch_time_series_resource_names(
+        self, run_name: str, run_resource_name: str
+    ):
+        """Populates the time series cache with every time series in the run.
+
+        Args:
+            run_name (str):
+                Required. The name of the run.
+            run_resource_name (str):
+                Required. The resource name of the run.
+        """
+        if run_name in self._time_series_prefetched_runs:
+            return
+        tag_to_time_series_name = self._run_to_tag_to_time_series_name.setdefault(
+            run_name, {}
+        )
+        list_of_time_series = self._api.list_tensorboard_time_series(
+            request=tensorboard_service.ListTensorboardTimeSeriesRequest(
+                parent=run_resource_name
+            )
+        )
+        for tag_name, time_series in _index_time_series_by_display_name(
+            list_of_time_series
+        ).items():
+            tag_to_time_series_name[tag_name] = time_series.name
+        self._time_series_prefetched_runs.add(run_name)
 
     def _create_or_get_time_series(
         self,
@@ -219,33 +649,421 @@ class OnePlatformResourceManager(object):
             # If the time series display name already exists then retrieve it
             if "already exist" in e.message:
                 list_of_time_series = self._api.list_tensorboard_time_series(
-                    request=tensorboard_service.ListTensorboardTimeSeriesRequest(
-                        parent=run_resource_name,
-                        filter="display_name = {}".format(json.dumps(str(tag_name))),
+                    request=_list_time_series_by_display_name_request(
+                        run_resource_name, str(tag_name)
                     )
                 )
-                num = 0
-                time_series = None
+                time_series = _unique_time_series(list_of_time_series, tag_name)
+            else:
+                raise
+        return time_series
 
-                for ts in list_of_time_series:
-                    num += 1
-                    if num > 1:
-                        break
-                    time_series = ts
 
-                if not time_series:
+class AsyncOnePlatformResourceManager(object):
+    """Helper class managing One Platform resources with the async client.
+
+    Mirrors OnePlatformResourceManager, but awaits the service calls so that
+    many runs or time series can be resolved concurrently on one event loop.
+    """
+
+    __slots__ = (
+        "_experiment_resource_name",
+        "_api",
+        "_run_name_to_run_resource_name",
+        "_run_to_tag_to_time_series_name",
+        "_runs_prefetched",
+        "_time_series_prefetched_runs",
+        "_loop",
+        "_lock",
+        "_semaphore",
+        "_pending_runs",
+        "_pending_time_series_prefetches",
+        "_pending_time_series",
+    )
+
+    def __init__(
+        self, experiment_resource_name: str, api: TensorboardServiceAsyncClient
+    ):
+        """Constructor for AsyncOnePlatformResourceManager.
+
+        Args:
+            experiment_resource_name (str):
+                Required. The resource id for the run with the following format
+                projects/{project}/locations/{location}/tensorboards/{tensorboard}/experiments/{experiment}
+            api (TensorboardServiceAsyncClient):
+                Required. Async client for calling various tensorboard services.
+        """
+        self._experiment_resource_name = experiment_resource_name
+        self._api = api
+        self._run_name_to_run_resource_name: Dict[str, str] = {}
+        self._run_to_tag_to_time_series_name: Dict[str, Dict[str, str]] = {}
+        self._runs_prefetched = False
+        self._time_series_prefetched_runs: Set[str] = set()
+        # asyncio primitives and futures belong to the event loop they were
+        # created on, so they are (re)created by _ensure_loop_state whenever
+        # the manager is used from a different loop.
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock: Optional[asyncio.Lock] = None
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._pending_runs: Dict[str, asyncio.Future] = {}
+        self._pending_time_series_prefetches: Dict[str, asyncio.Future] = {}
+        self._pending_time_series: Dict[Tuple[str, str], asyncio.Future] = {}
+
+    def _ensure_loop_state(self):
+        """Binds the lock, semaphore and in-flight calls to the running loop."""
+        loop = asyncio.get_event_loop()
+        if loop is not self._loop:
+            self._loop = loop
+            self._lock = asyncio.Lock()
+            self._semaphore = asyncio.Semaphore(_MAX_RESOURCE_WORKERS)
+            self._pending_runs = {}
+            self._pending_time_series_prefetches = {}
+            self._pending_time_series = {}
+
+    @staticmethod
+    async def _join_pending(pending: Dict, key, coroutine_factory: Callable):
+        """Awaits the call in flight for `key`, starting one if there is none.
+
+        Args:
+            pending (Dict):
+                Required. Futures of the calls in flight, keyed by `key`.
+            key:
+                Required. The key identifying the call.
+            coroutine_factory (Callable):
+                Required. Makes the coroutine to run if no call is in flight.
+
+        Returns:
+            The result of the call.
+        """
+        future = pending.get(key)
+        if future is None:
+            future = asyncio.ensure_future(coroutine_factory())
+            pending[key] = future
+
+            def _remove_pending(done_future):
+                if pending.get(key) is done_future:
+                    del pending[key]
+
+            future.add_done_callback(_remove_pending)
+        # Shielded so that one cancelled waiter does not cancel the call the
+        # other waiters are sharing.
+        return await asyncio.shield(future)
+
+    async def get_run_resource_name(self, run_name: str) -> str:
+        """
+        Get the resource name of the run if it exists, otherwise creates the run
+        on One Platform before returning its resource name.
+
+        Args:
+            run_name (str):
+                Required. The name of the run.
+
+        Returns:
+            run_resource (str):
+                Resource name of the run.
+        """
+        if run_name in self._run_name_to_run_resource_name:
+            return self._run_name_to_run_resource_name[run_name]
+
+        self._ensure_loop_state()
+        if not self._runs_prefetched:
+            # The lock only guards the one-time listing of existing runs.
+            async with self._lock:
+                if not self._runs_prefetched:
+                    async for tb_run in await self._api.list_tensorboard_runs(
+                        parent=self._experiment_resource_name
+                    ):
+                        self._run_name_to_run_resource_name[
+                            tb_run.display_name
+                        ] = tb_run.name
+                    self._runs_prefetched = True
+        if run_name not in self._run_name_to_run_resource_name:
+            # Concurrent callers asking for the same new run share one create.
+            await self._join_pending(
+                self._pending_runs,
+                run_name,
+                lambda: self._create_and_cache_run_resource_name(run_name),
+            )
+        return self._run_name_to_run_resource_name[run_name]
+
+    async def _create_and_cache_run_resource_name(self, run_name: str):
+        """Creates or gets a run, bounded by the shared semaphore.
+
+        Args:
+            run_name (str):
+                Required. The name of the run.
+        """
+        async with self._semaphore:
+            tb_run = await self._create_or_get_run_resource(run_name)
+        self._run_name_to_run_resource_name[run_name] = tb_run.name
+
+    async def _create_or_get_run_resource(self, run_name: str) -> TensorboardRun:
+        """Creates a new run resource in current tensorboard experiment resource.
+
+        Args:
+            run_name (str):
+                Required. The display name of this run.
+
+        Returns:
+            tb_run (google.cloud.aiplatform_v1beta1.types.TensorboardRun):
+                The TensorboardRun given the run_name.
+
+        Raises:
+            ExistingResourceNotFoundError:
+                Run name could not be found in resource list.
+            exceptions.InvalidArgument:
+                run_name argument is invalid.
+        """
+        tb_run = tensorboard_run.TensorboardRun()
+        tb_run.display_name = run_name
+        try:
+            tb_run = await self._api.create_tensorboard_run(
+                parent=self._experiment_resource_name,
+                tensorboard_run=tb_run,
+                tensorboard_run_id=uuid.uuid4().hex,
+            )
+        except exceptions.InvalidArgument as e:
+            # If the run name already exists then retrieve it
+            if "already exist" in e.message:
+                runs_pages = await self._api.list_tensorboard_runs(
+                    request=tensorboard_service.ListTensorboardRunsRequest(
+                        parent=self._experiment_resource_name,
+                        filter=_display_name_filter(str(run_name)),
+                    )
+                )
+                tb_run = None
+                async for tb_run in runs_pages:
+                    break
+
+                if tb_run is None:
                     raise ExistingResourceNotFoundError(
-                        "Could not find time series resource with display name: {}".format(
-                            tag_name
-                        )
+                        "Run with name %s already exists but is not resource list."
+                        % run_name
                     )
+            else:
+                raise
+        else:
+            # A run created by this manager has no time series yet, so there
+            # is nothing to prefetch for it.
+            self._time_series_prefetched_runs.add(run_name)
+        return tb_run
 
-                if num != 1:
-                    raise ValueError(
-                        "More than one time series resource found with display_name: {}".format(
-                            tag_name
-                        )
+    async def get_time_series_resource_name(
+        self,
+        run_name: str,
+        tag_name: str,
+        time_series_resource_creator: Callable[
+            [], tensorboard_time_series.TensorboardTimeSeries
+        ],
+    ) -> str:
+        """
+        Get the resource name of the time series corresponding to the tag, if it
+        exists, otherwise creates the time series on One Platform before
+        returning its resource name.
+
+        Args:
+            run_name (str):
+                Required. The name of the run.
+            tag_name (str):
+                Required. The name of the tag.
+            time_series_resource_creator (tensorboard_time_series.TensorboardTimeSeries):
+                Required. A constructor used for creating the time series on One Platform.
+
+        Returns:
+            time_series_name (str):
+                Resource name of the time series
+        """
+        names = await self.bulk_get_time_series_resource_names(
+            run_name, [(tag_name, time_series_resource_creator)]
+        )
+        return names[tag_name]
+
+    async def bulk_get_time_series_resource_names(
+        self,
+        run_name: str,
+        tag_creator_pairs: Iterable[
+            Tuple[str, Callable[[], tensorboard_time_series.TensorboardTimeSeries]]
+        ],
+    ) -> Dict[str, str]:
+        """
+        Get the resource names of several time series of a run, concurrently
+        creating on One Platform the ones that do not exist yet.
+
+        Args:
+            run_name (str):
+                Required. The name of the run.
+            tag_creator_pairs (Iterable[Tuple[str, Callable[[], tensorboard_time_series.TensorboardTimeSeries]]]):
+                Required. Pairs of tag name and a constructor used for creating
+                the time series on One Platform.
+
+        Returns:
+            time_series_names (Dict[str, str]):
+                Mapping from tag name to the resource name of the time series.
+        """
+        tag_creator_pairs: List[
+            Tuple[str, Callable[[], tensorboard_time_series.TensorboardTimeSeries]]
+        ] = list(dict(tag_creator_pairs).items())
+        run_resource_name = await self.get_run_resource_name(run_name)
+        tag_to_time_series_name = self._run_to_tag_to_time_series_name.setdefault(
+            run_name, {}
+        )
+        if run_name not in self._time_series_prefetched_runs and any(
+            tag_name not in tag_to_time_series_name for tag_name, _ in tag_creator_pairs
+        ):
+            self._ensure_loop_state()
+            # Concurrent callers for the same run share one listing.
+            await self._join_pending(
+                self._pending_time_series_prefetches,
+                run_name,
+                lambda: self._prefetch_time_series_resource_names(
+                    run_name, run_resource_name
+                ),
+            )
+
+        time_series_names = await asyncio.gather(
+            *[
+                self._get_or_create_time_series_name(
+                    run_name, run_resource_name, tag_name, creator
+                )
+                for tag_name, creator in tag_creator_pairs
+            ]
+        )
+        return dict(
+            zip((tag_name for tag_name, _ in tag_creator_pairs), time_series_names)
+        )
+
+    async def _prefetch_time_series_resource_names(
+        self, run_name: str, run_resource_name: str
+    ):
+        """Populates the time series cache with every time series in the run.
+
+        Args:
+            run_name (str):
+                Required. The name of the run.
+            run_resource_name (str):
+                Required. The resource name of the run.
+        """
+        async with self._semaphore:
+            list_of_time_series = await self._api.list_tensorboard_time_series(
+                request=tensorboard_service.ListTensorboardTimeSeriesRequest(
+                    parent=run_resource_name
+                )
+            )
+            listed_time_series = [
+                time_series async for time_series in list_of_time_series
+            ]
+        tag_to_time_series_name = self._run_to_tag_to_time_series_name[run_name]
+        for tag_name, time_series in _index_time_series_by_display_name(
+            listed_time_series
+        ).items():
+            tag_to_time_series_name[tag_name] = time_series.name
+        self._time_series_prefetched_runs.add(run_name)
+
+    async def _get_or_create_time_series_name(
+        self,
+        run_name: str,
+        run_resource_name: str,
+        tag_name: str,
+        time_series_resource_creator: Callable[
+            [], tensorboard_time_series.TensorboardTimeSeries
+        ],
+    ) -> str:
+        """Returns the cached time series name, joining any creation in flight.
+
+        Args:
+            run_name (str):
+                Required. The name of the run.
+            run_resource_name (str):
+                Required. The resource name of the run.
+            tag_name (str):
+                Required. The name of the tag.
+            time_series_resource_creator (Callable[[], tensorboard_time_series.TensorboardTimeSeries]):
+                Required. A constructor used for creating the time series on One Platform.
+
+        Returns:
+            time_series_name (str):
+                Resource name of the time series.
+        """
+        tag_to_time_series_name = self._run_to_tag_to_time_series_name[run_name]
+        if tag_name in tag_to_time_series_name:
+            return tag_to_time_series_name[tag_name]
+
+        self._ensure_loop_state()
+        return await self._join_pending(
+            self._pending_time_series,
+            (run_name, tag_name),
+            lambda: self._create_and_cache_time_series(
+                run_name, run_resource_name, tag_name, time_series_resource_creator
+            ),
+        )
+
+    async def _create_and_cache_time_series(
+        self,
+        run_name: str,
+        run_resource_name: str,
+        tag_name: str,
+        time_series_resource_creator: Callable[
+            [], tensorboard_time_series.TensorboardTimeSeries
+        ],
+    ) -> str:
+        """Creates or gets a time series, bounded by the shared semaphore."""
+        async with self._semaphore:
+            time_series = await self._create_or_get_time_series(
+                run_resource_name, tag_name, time_series_resource_creator
+            )
+        self._run_to_tag_to_time_series_name[run_name][tag_name] = time_series.name
+        return time_series.name
+
+    async def _create_or_get_time_series(
+        self,
+        run_resource_name: str,
+        tag_name: str,
+        time_series_resource_creator: Callable[
+            [], tensorboard_time_series.TensorboardTimeSeries
+        ],
+    ) -> tensorboard_time_series.TensorboardTimeSeries:
+        """
+        Get a time series resource with given tag_name, and create a new one on
+        OnePlatform if not present.
+
+        Args:
+            tag_name (str):
+                Required. The tag name of the time series in the Tensorboard log dir.
+            time_series_resource_creator (Callable[[], tensorboard_time_series.TensorboardTimeSeries):
+                Required. A callable that produces a TimeSeries for creation.
+
+        Returns:
+            time_series (tensorboard_time_series.TensorboardTimeSeries):
+                A created or existing tensorboard_time_series.TensorboardTimeSeries.
+
+        Raises:
+            exceptions.InvalidArgument:
+                Invalid run_resource_name, tag_name, or time_series_resource_creator.
+            ExistingResourceNotFoundError:
+                Could not find the resource given the tag name.
+            ValueError:
+                More than one time series with the resource name was found.
+        """
+        time_series = time_series_resource_creator()
+        time_series.display_name = tag_name
+        try:
+            time_series = await self._api.create_tensorboard_time_series(
+                parent=run_resource_name, tensorboard_time_series=time_series
+            )
+        except exceptions.InvalidArgument as e:
+            # If the time series display name already exists then retrieve it
+            if "already exist" in e.message:
+                list_of_time_series = await self._api.list_tensorboard_time_series(
+                    request=_list_time_series_by_display_name_request(
+                        run_resource_name, str(tag_name)
                     )
+                )
+                results = []
+                async for time_series in list_of_time_series:
+                    results.append(time_series)
+                    if len(results) > 1:
+                        break
+                time_series = _unique_time_series(results, tag_name)
             else:
                 raise
         return time_series
@@ -254,6 +1072,13 @@ class OnePlatformResourceManager(object):
 class TimeSeriesResourceManager(object):
     """Helper class managing Time Series resources."""
 
+    __slots__ = (
+        "_run_resource_id",
+        "_api",
+        "_tag_to_time_series_proto",
+        "_prefetched",
+    )
+
     def __init__(self, run_resource_id: str, api: TensorboardServiceClient):
         """Constructor for TimeSeriesResourceManager.
 
@@ -269,6 +1094,7 @@ class TimeSeriesResourceManager(object):
         self._tag_to_time_series_proto: Dict[
             str, tensorboard_time_series.TensorboardTimeSeries
         ] = {}
+        self._prefetched = False
 
     def get_or_create(
         self,
@@ -300,6 +1126,20 @@ class TimeSeriesResourceManager(object):
             ValueError:
                 More than one time series with the resource name was found.
         """
+        if not self._prefetched:
+            # Warm the cache with every existing time series in the run so
+            # that only new tags need a create call.
+            self._tag_to_time_series_proto.update(
+                _index_time_series_by_display_name(
+                    self._api.list_tensorboard_time_series(
+                        request=tensorboard_service.ListTensorboardTimeSeriesRequest(
+                            parent=self._run_resource_id
+                        )
+                    )
+                )
+            )
+            self._prefetched = True
+
         if tag_name in self._tag_to_time_series_proto:
             return self._tag_to_time_series_proto[tag_name]
 
@@ -313,34 +1153,11 @@ class TimeSeriesResourceManager(object):
             # If the time series display name already exists then retrieve it
             if "already exist" in e.message:
                 list_of_time_series = self._api.list_tensorboard_time_series(
-                    request=tensorboard_service.ListTensorboardTimeSeriesRequest(
-                        parent=self._run_resource_id,
-                        filter="display_name = {}".format(json.dumps(str(tag_name))),
+                    request=_list_time_series_by_display_name_request(
+                        self._run_resource_id, str(tag_name)
                     )
                 )
-
-                num = 0
-                time_series = None
-
-                for ts in list_of_time_series:
-                    num += 1
-                    if num > 1:
-                        break
-                    time_series = ts
-
-                if not time_series:
-                    raise ExistingResourceNotFoundError(
-                        "Could not find time series resource with display name: {}".format(
-                            tag_name
-                        )
-                    )
-
-                if num != 1:
-                    raise ValueError(
-                        "More than one time series resource found with display_name: {}".format(
-                            tag_name
-                        )
-                    )
+                time_series = _unique_time_series(list_of_time_series, tag_name)
             else:
                 raise
 
@@ -348,6 +1165,31 @@ class TimeSeriesResourceManager(object):
         return time_series
 
 
+def _get_storage_client() -> storage.Client:
+    """Returns a storage client shared by the module, creating it on first use.
+
+    Returns:
+        client (storage.Client):
+            The shared storage client.
+    """
+    global _storage_client
+    with _storage_client_lock:
+        if _storage_client is None:
+            client = storage.Client()
+            # Keep-alive connections are reused across requests, so a larger
+            # pool avoids repeated TCP and TLS handshakes under concurrency.
+            client._http.mount(  # pylint: disable=protected-access
+                "https://",
+                adapters.HTTPAdapter(
+                    pool_connections=_STORAGE_POOL_CONNECTIONS,
+                    pool_maxsize=_STORAGE_POOL_MAXSIZE,
+                    max_retries=retry.Retry(total=3, backoff_factor=0.2),
+                ),
+            )
+            _storage_client = client
+    return _storage_client
+
+
 def get_source_bucket(logdir: str) -> Optional[storage.Bucket]:
     """Returns a storage bucket object given a log directory.
 
@@ -359,10 +1201,10 @@ def get_source_bucket(logdir: str) -> Optional[storage.Bucket]:
         bucket (Optional[storage.Bucket]):
             A bucket if the path is a gs bucket, None otherwise.
     """
-    m = re.match(r"gs:\/\/(.*?)(?=\/|$)", logdir)
+    m = _GS_URI_RE.match(logdir)
     if not m:
         return None
-    bucket = storage.Client().bucket(m[1])
+    bucket = _get_storage_client().bucket(m[1])
     return bucket
 
 
@@ -379,11 +1221,132 @@ def request_logger(
     Yields:
         An empty response when the request logger has started.
     """
-    upload_start_time = time.time()
+    # Computing the request size walks the whole message, so skip it unless
+    # it is actually going to be logged.
+    if not logger.isEnabledFor(logging.INFO):
+        yield
+        return
+
+    upload_start_time = time.perf_counter()
     request_bytes = request._pb.ByteSize()  # pylint: disable=protected-access
     logger.info("Trying request of %d bytes", request_bytes)
     yield
-    upload_duration_secs = time.time() - upload_start_time
+    upload_duration_secs = time.perf_counter() - upload_start_time
     logger.info(
         "Upload of (%d bytes) took %.3f seconds", request_bytes, upload_duration_secs,
     )
+
+
+class BatchingWriter(object):
+    """Accumulates run data writes and sends them as few, larger requests.
+
+    Each `add(...)` merges the time series data of a
+    WriteTensorboardRunDataRequest into a buffered request. The buffer is sent
+    before it would grow past `max_request_size` bytes, on an `add(...)` once
+    its oldest data is more than `max_delay_secs` old, and on `flush()`. There
+    is no background timer, so callers must call `flush()` once done adding.
+    Callers that already flush at a natural boundary can pass
+    `max_delay_secs=None` to only send on size and on `flush()`.
+
+    A request that fails to send is kept, together with any filled after it,
+    and sent again by the next `flush()`.
+
+    This class is not threadsafe. Use external synchronization if calling its
+    methods concurrently.
+    """
+
+    def __init__(
+        self,
+        api: TensorboardServiceClient,
+        run_resource_name: str,
+        max_request_size: int = _DEFAULT_MAX_BATCHED_WRITE_SIZE,
+        max_delay_secs: Optional[float] = _DEFAULT_MAX_BATCHED_WRITE_DELAY_SECS,
+    ):
+        """Constructor for BatchingWriter.
+
+        Args:
+            api (TensorboardServiceClient):
+                Required. Tensorboard service client used to send the requests.
+            run_resource_name (str):
+                Required. The resource name of the run to write to, with the format
+                projects/{project}/locations/{location}/tensorboards/{tensorboard}/experiments/{experiment}/runs/{run}
+            max_request_size (int):
+                Optional. Byte budget of a single batched request.
+            max_delay_secs (float):
+                Optional. Age of the oldest buffered data after which the
+                next `add(...)` sends the buffer. None disables the age limit.
+        """
+        self._api = api
+        self._run_resource_name = run_resource_name
+        self._max_request_size = max_request_size
+        self._max_delay_secs = max_delay_secs
+        # Filled requests waiting to be sent, oldest first.
+        self._unsent_requests: List[
+            tensorboard_service.WriteTensorboardRunDataRequest
+        ] = []
+        self._new_request()
+
+    def _new_request(self):
+        """Starts a new, empty buffered request."""
+        self._request = tensorboard_service.WriteTensorboardRunDataRequest()
+        self._time_series_id_to_index: Dict[str, int] = {}
+        self._request_bytes = 0
+        self._oldest_add_time: Optional[float] = None
+
+    def add(self, request: tensorboard_service.WriteTensorboardRunDataRequest):
+        """Adds the time series data of a request to the buffered request.
+
+        Args:
+            request (tensorboard_service.WriteTensorboardRunDataRequest):
+                Required. A write request for the run of this writer.
+        """
+        request_bytes = request._pb.ByteSize()  # pylint: disable=protected-access
+        if (
+            self._request_bytes
+            and self._request_bytes + request_bytes > self._max_request_size
+        ):
+            self.flush()
+
+        for time_series_data in request.time_series_data:
+            time_series_id = time_series_data.tensorboard_time_series_id
+            index = self._time_series_id_to_index.get(time_series_id)
+            if index is None:
+                self._time_series_id_to_index[time_series_id] = len(
+                    self._request.time_series_data
+                )
+                self._request.time_series_data.append(time_series_data)
+            else:
+                self._request.time_series_data[index].values.extend(
+                    time_series_data.values
+                )
+        self._request_bytes += request_bytes
+
+        if self._max_delay_secs is None:
+            return
+        if self._oldest_add_time is None:
+            self._oldest_add_time = time.monotonic()
+        elif time.monotonic() - self._oldest_add_time >= self._max_delay_secs:
+            self.flush()
+
+    def flush(self):
+        """Sends the buffered request and any unsent ones, oldest first.
+
+        Sending stops at the first failed request, which is kept with the
+        requests after it for the next `flush()`.
+        """
+        if self._request.time_series_data:
+            self._unsent_requests.append(self._request)
+            self._new_request()
+
+        while self._unsent_requests:
+            request = self._unsent_requests[0]
+            with request_logger(request):
+                try:
+                    self._api.write_tensorboard_run_data(
+                        tensorboard_run=self._run_resource_name,
+                        time_series_data=request.time_series_data,
+                    )
+                except exceptions.GoogleAPICallError as e:
+                    logger.error("Upload call failed with error %s", e)
+                    return
+            self._unsent_requests.pop(0)
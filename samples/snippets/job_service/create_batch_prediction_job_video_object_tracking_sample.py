@@ -14,8 +14,7 @@
 
 # [START aiplatform_create_batch_prediction_job_video_object_tracking_sample]
 from google.cloud import aiplatform
-from google.protobuf import json_format
-from google.protobuf.struct_pb2 import Value
+from google.protobuf.struct_pb2 import Struct, Value
 
 
 def create_batch_prediction_job_video_object_tracking_sample(
@@ -32,8 +31,9 @@ def create_batch_prediction_job_video_object_tracking_sample(
     # Initialize client that will be used to create and send requests.
     # This client only needs to be created once, and can be reused for multiple requests.
     client = aiplatform.gapic.JobServiceClient(client_options=client_options)
-    model_parameters_dict = {"confidenceThreshold": 0.0}
-    model_parameters = json_format.ParseDict(model_parameters_dict, Value())
+    model_parameters = Value(
+        struct_value=Struct(fields={"confidenceThreshold": Value(number_value=0.0)})
+    )
 
     batch_prediction_job = {
         "display_name": display_name,
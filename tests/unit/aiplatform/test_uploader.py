@@ -16,16 +16,19 @@
 #
 """Tests for uploader.py."""
 
+import asyncio
 import datetime
 import functools
+import itertools
 import logging
 import os
 import re
 import tempfile
-from unittest import mock
 
 import grpc
+import mock
 import grpc_testing
+from requests import adapters
 from tensorboard.compat.proto import event_pb2
 from tensorboard.compat.proto import graph_pb2
 from tensorboard.compat.proto import meta_graph_pb2
@@ -42,11 +45,13 @@ from tensorboard.uploader.proto import server_info_pb2
 import tensorflow as tf
 
 from google.api_core import datetime_helpers
+from google.api_core import exceptions
 from google.cloud.aiplatform.tensorboard import uploader_utils
 from google.cloud.aiplatform.tensorboard.plugins.tf_profiler import profile_uploader
 import google.cloud.aiplatform.tensorboard.uploader as uploader_lib
 from google.cloud import storage
 from google.cloud.aiplatform.compat.services import tensorboard_service_client_v1beta1
+from google.cloud.aiplatform_v1beta1.services.tensorboard_service import pagers
 from google.cloud.aiplatform_v1beta1.services.tensorboard_service.transports import (
     grpc as transports_grpc,
 )
@@ -59,6 +64,9 @@ from google.cloud.aiplatform.compat.types import (
 from google.cloud.aiplatform.compat.types import (
     tensorboard_run_v1beta1 as tensorboard_run_type,
 )
+from google.cloud.aiplatform.compat.types import (
+    tensorboard_service_v1beta1 as tensorboard_service_type,
+)
 from google.cloud.aiplatform.compat.types import (
     tensorboard_time_series_v1beta1 as tensorboard_time_series_type,
 )
@@ -170,6 +178,8 @@ def _create_mock_client():
     mock_client.create_tensorboard_time_series.side_effect = (
         create_tensorboard_time_series
     )
+    mock_client.list_tensorboard_runs.return_value = []
+    mock_client.list_tensorboard_time_series.return_value = []
     return mock_client
 
 
@@ -1243,7 +1253,8 @@ class ProfileRequestSenderTest(tf.test.TestCase):
             with named_temp(dir=run_paths[0]), named_temp(dir=run_paths[1]):
                 call_args_list = self._populate_run_from_events(events, logdir)
 
-        self.assertLen(call_args_list, 2)
+        # Both profile sessions are written in a single batched request.
+        self.assertLen(call_args_list, 1)
         profile_tag_counts = _extract_tag_counts_time_series(call_args_list)
         self.assertEqual(profile_tag_counts, dict.fromkeys(prof_run_names, 1))
 
@@ -1780,6 +1791,7 @@ class FileRequestSenderTest(tf.test.TestCase):
                     datetime.datetime.strptime("2020-01-01", "%Y-%m-%d")
                 ),
             )
+            sender.flush_writes()
 
         call_args_list = mock_client.write_tensorboard_run_data.call_args_list[0][1]
         self.assertEqual(
@@ -1803,6 +1815,7 @@ class FileRequestSenderTest(tf.test.TestCase):
                     datetime.datetime.strptime("2020-01-01", "%Y-%m-%d")
                 ),
             )
+            sender.flush_writes()
 
         call_args_list = mock_client.write_tensorboard_run_data.call_args_list[0][1]
 
@@ -1816,7 +1829,9 @@ class FileRequestSenderTest(tf.test.TestCase):
 
     def test_add_files_no_experiment(self):
         mock_client = _create_mock_client()
-        mock_client.write_tensorboard_run_data.side_effect = grpc.RpcError
+        mock_client.write_tensorboard_run_data.side_effect = exceptions.NotFound(
+            "Experiment not found"
+        )
 
         sender = _create_file_request_sender(
             api=mock_client, run_resource_id=_TEST_ONE_PLATFORM_RUN_NAME,
@@ -1831,6 +1846,7 @@ class FileRequestSenderTest(tf.test.TestCase):
                     datetime.datetime.strptime("2020-01-01", "%Y-%m-%d")
                 ),
             )
+            sender.flush_writes()
 
         mock_client.write_tensorboard_run_data.assert_called_once()
 
@@ -1867,6 +1883,757 @@ class FileRequestSenderTest(tf.test.TestCase):
         self.assertLen(sender._source_bucket.copy_blob.call_args_list, 1)
 
 
+class OnePlatformResourceManagerTest(tf.test.TestCase):
+    def test_get_run_resource_name_prefetches_existing_runs(self):
+        mock_client = _create_mock_client()
+        mock_client.list_tensorboard_runs.return_value = [
+            tensorboard_run_type.TensorboardRun(
+                name=_TEST_ONE_PLATFORM_RUN_NAME, display_name=_TEST_RUN_NAME
+            ),
+        ]
+        manager = uploader_utils.OnePlatformResourceManager(
+            _TEST_ONE_PLATFORM_EXPERIMENT_NAME, mock_client
+        )
+
+        self.assertEqual(
+            _TEST_ONE_PLATFORM_RUN_NAME, manager.get_run_resource_name(_TEST_RUN_NAME)
+        )
+        manager.get_run_resource_name("new-run")
+        manager.get_run_resource_name("new-run")
+
+        mock_client.list_tensorboard_runs.assert_called_once()
+        mock_client.create_tensorboard_run.assert_called_once()
+
+    def test_get_time_series_resource_name_prefetches_existing_time_series(self):
+        mock_client = _create_mock_client()
+        mock_client.list_tensorboard_runs.return_value = [
+            tensorboard_run_type.TensorboardRun(
+                name=_TEST_ONE_PLATFORM_RUN_NAME, display_name=_TEST_RUN_NAME
+            ),
+        ]
+        mock_client.list_tensorboard_time_series.return_value = [
+            tensorboard_time_series_type.TensorboardTimeSeries(
+                name=_TEST_ONE_PLATFORM_TIME_SERIES_NAME,
+                display_name=_TEST_TIME_SERIES_NAME,
+            ),
+        ]
+        manager = uploader_utils.OnePlatformResourceManager(
+            _TEST_ONE_PLATFORM_EXPERIMENT_NAME, mock_client
+        )
+        creator = tensorboard_time_series_type.TensorboardTimeSeries
+
+        self.assertEqual(
+            _TEST_ONE_PLATFORM_TIME_SERIES_NAME,
+            manager.get_time_series_resource_name(
+                _TEST_RUN_NAME, _TEST_TIME_SERIES_NAME, creator
+            ),
+        )
+        manager.get_time_series_resource_name(_TEST_RUN_NAME, "new-tag", creator)
+
+        mock_client.list_tensorboard_time_series.assert_called_once()
+        mock_client.create_tensorboard_time_series.assert_called_once()
+
+    def test_get_time_series_resource_name_prefetch_skips_duplicates(self):
+        mock_client = _create_mock_client()
+        mock_client.list_tensorboard_runs.return_value = [
+            tensorboard_run_type.TensorboardRun(
+                name=_TEST_ONE_PLATFORM_RUN_NAME, display_name=_TEST_RUN_NAME
+            ),
+        ]
+        duplicates = [
+            tensorboard_time_series_type.TensorboardTimeSeries(
+                name="{}-{}".format(_TEST_ONE_PLATFORM_TIME_SERIES_NAME, i),
+                display_name=_TEST_TIME_SERIES_NAME,
+            )
+            for i in range(2)
+        ]
+        mock_client.list_tensorboard_time_series.return_value = duplicates
+        mock_client.create_tensorboard_time_series.side_effect = exceptions.InvalidArgument(
+            "Time series already exist"
+        )
+        manager = uploader_utils.OnePlatformResourceManager(
+            _TEST_ONE_PLATFORM_EXPERIMENT_NAME, mock_client
+        )
+
+        with self.assertRaises(ValueError):
+            manager.get_time_series_resource_name(
+                _TEST_RUN_NAME,
+                _TEST_TIME_SERIES_NAME,
+                tensorboard_time_series_type.TensorboardTimeSeries,
+            )
+
+    def test_get_time_series_resource_name_new_run_skips_prefetch(self):
+        mock_client = _create_mock_client()
+        manager = uploader_utils.OnePlatformResourceManager(
+            _TEST_ONE_PLATFORM_EXPERIMENT_NAME, mock_client
+        )
+
+        manager.get_time_series_resource_name(
+            _TEST_RUN_NAME,
+            _TEST_TIME_SERIES_NAME,
+            tensorboard_time_series_type.TensorboardTimeSeries,
+        )
+
+        mock_client.create_tensorboard_run.assert_called_once()
+        mock_client.list_tensorboard_time_series.assert_not_called()
+        mock_client.create_tensorboard_time_series.assert_called_once()
+
+    def test_get_run_resource_name_already_exists_filters_by_display_name(self):
+        mock_client = _create_mock_client()
+        mock_client.create_tensorboard_run.side_effect = exceptions.InvalidArgument(
+            "Run already exist"
+        )
+        existing_run = tensorboard_run_type.TensorboardRun(
+            name=_TEST_ONE_PLATFORM_RUN_NAME, display_name=_TEST_RUN_NAME
+        )
+        mock_client.list_tensorboard_runs.side_effect = [[], [existing_run]]
+        manager = uploader_utils.OnePlatformResourceManager(
+            _TEST_ONE_PLATFORM_EXPERIMENT_NAME, mock_client
+        )
+
+        self.assertEqual(
+            _TEST_ONE_PLATFORM_RUN_NAME, manager.get_run_resource_name(_TEST_RUN_NAME)
+        )
+        request = mock_client.list_tensorboard_runs.call_args[1]["request"]
+        self.assertEqual('display_name = "{}"'.format(_TEST_RUN_NAME), request.filter)
+
+    def test_get_run_resource_name_already_exists_not_found(self):
+        mock_client = _create_mock_client()
+        mock_client.create_tensorboard_run.side_effect = exceptions.InvalidArgument(
+            "Run already exist"
+        )
+        manager = uploader_utils.OnePlatformResourceManager(
+            _TEST_ONE_PLATFORM_EXPERIMENT_NAME, mock_client
+        )
+
+        with self.assertRaises(uploader_utils.ExistingResourceNotFoundError):
+            manager.get_run_resource_name(_TEST_RUN_NAME)
+
+    def test_get_time_series_resource_name_caches_failures(self):
+        mock_client = _create_mock_client()
+        create_time_series = mock_client.create_tensorboard_time_series.side_effect
+        mock_client.create_tensorboard_time_series.side_effect = exceptions.InvalidArgument(
+            "Invalid time series", errors=["bad tag"], response=mock.sentinel.response
+        )
+        manager = uploader_utils.OnePlatformResourceManager(
+            _TEST_ONE_PLATFORM_EXPERIMENT_NAME, mock_client
+        )
+        creator = tensorboard_time_series_type.TensorboardTimeSeries
+
+        for _ in range(2):
+            with self.assertRaises(exceptions.InvalidArgument) as cm:
+                manager.get_time_series_resource_name(
+                    _TEST_RUN_NAME, _TEST_TIME_SERIES_NAME, creator
+                )
+            self.assertEqual(["bad tag"], cm.exception.errors)
+            self.assertIs(mock.sentinel.response, cm.exception.response)
+        mock_client.create_tensorboard_time_series.assert_called_once()
+
+        mock_client.create_tensorboard_time_series.side_effect = create_time_series
+        with mock.patch.object(uploader_utils, "_NEGATIVE_CACHE_TTL_SECS", 0):
+            manager.get_time_series_resource_name(
+                _TEST_RUN_NAME, _TEST_TIME_SERIES_NAME, creator
+            )
+        self.assertEqual(2, mock_client.create_tensorboard_time_series.call_count)
+
+    def test_get_time_series_resource_name_does_not_cache_retryable_failures(self):
+        mock_client = _create_mock_client()
+        create_time_series = mock_client.create_tensorboard_time_series.side_effect
+        mock_client.create_tensorboard_time_series.side_effect = exceptions.ServiceUnavailable(
+            "Try again"
+        )
+        manager = uploader_utils.OnePlatformResourceManager(
+            _TEST_ONE_PLATFORM_EXPERIMENT_NAME, mock_client
+        )
+        creator = tensorboard_time_series_type.TensorboardTimeSeries
+
+        with self.assertRaises(exceptions.ServiceUnavailable):
+            manager.get_time_series_resource_name(
+                _TEST_RUN_NAME, _TEST_TIME_SERIES_NAME, creator
+            )
+        mock_client.create_tensorboard_time_series.side_effect = create_time_series
+        manager.get_time_series_resource_name(
+            _TEST_RUN_NAME, _TEST_TIME_SERIES_NAME, creator
+        )
+
+        self.assertEqual(2, mock_client.create_tensorboard_time_series.call_count)
+
+    def test_get_time_series_resource_name_does_not_cache_not_found(self):
+        mock_client = _create_mock_client()
+        mock_client.create_tensorboard_time_series.side_effect = exceptions.InvalidArgument(
+            "Time series already exist"
+        )
+        existing = tensorboard_time_series_type.TensorboardTimeSeries(
+            name=_TEST_ONE_PLATFORM_TIME_SERIES_NAME,
+            display_name=_TEST_TIME_SERIES_NAME,
+        )
+        # The run is created by the manager, so the list calls are display
+        # name lookups; the first one lags behind the create.
+        mock_client.list_tensorboard_time_series.side_effect = [[], [existing]]
+        manager = uploader_utils.OnePlatformResourceManager(
+            _TEST_ONE_PLATFORM_EXPERIMENT_NAME, mock_client
+        )
+        creator = tensorboard_time_series_type.TensorboardTimeSeries
+
+        with self.assertRaises(uploader_utils.ExistingResourceNotFoundError):
+            manager.get_time_series_resource_name(
+                _TEST_RUN_NAME, _TEST_TIME_SERIES_NAME, creator
+            )
+
+        self.assertEqual(
+            _TEST_ONE_PLATFORM_TIME_SERIES_NAME,
+            manager.get_time_series_resource_name(
+                _TEST_RUN_NAME, _TEST_TIME_SERIES_NAME, creator
+            ),
+        )
+
+    def test_bulk_get_run_resource_names(self):
+        mock_client = _create_mock_client()
+        manager = uploader_utils.OnePlatformResourceManager(
+            _TEST_ONE_PLATFORM_EXPERIMENT_NAME, mock_client
+        )
+
+        run_resource_names = manager.bulk_get_run_resource_names(
+            ["run-1", "run-2", "run-1"]
+        )
+
+        self.assertCountEqual(["run-1", "run-2"], run_resource_names.keys())
+        self.assertEqual(2, mock_client.create_tensorboard_run.call_count)
+        self.assertEqual(
+            run_resource_names["run-1"], manager.get_run_resource_name("run-1")
+        )
+
+    def test_bulk_get_time_series_resource_names(self):
+        mock_client = _create_mock_client()
+        manager = uploader_utils.OnePlatformResourceManager(
+            _TEST_ONE_PLATFORM_EXPERIMENT_NAME, mock_client
+        )
+        creator = tensorboard_time_series_type.TensorboardTimeSeries
+        tags = ["tag-{}".format(i) for i in range(10)]
+
+        time_series_names = manager.bulk_get_time_series_resource_names(
+            _TEST_RUN_NAME, [(tag, creator) for tag in tags]
+        )
+
+        self.assertCountEqual(tags, time_series_names.keys())
+        for tag in tags:
+            self.assertTrue(time_series_names[tag].endswith("/timeSeries/" + tag))
+        self.assertEqual(10, mock_client.create_tensorboard_time_series.call_count)
+        mock_client.create_tensorboard_run.assert_called_once()
+
+
+async def _async_pager(items):
+    for item in items:
+        yield item
+
+
+def _run_coroutine(coro):
+    loop = asyncio.new_event_loop()
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+def _create_mock_async_client():
+    def create_run_response(
+        tensorboard_run=None, tensorboard_run_id=None, parent=None
+    ):  # pylint: disable=unused-argument
+        return tensorboard_run_type.TensorboardRun(
+            name="{}/runs/{}".format(parent, tensorboard_run_id)
+        )
+
+    def create_tensorboard_time_series(tensorboard_time_series=None, parent=None):
+        return tensorboard_time_series_type.TensorboardTimeSeries(
+            name="{}/timeSeries/{}".format(
+                parent, tensorboard_time_series.display_name
+            ),
+            display_name=tensorboard_time_series.display_name,
+        )
+
+    mock_client = mock.Mock()
+    mock_client.create_tensorboard_run = mock.AsyncMock(side_effect=create_run_response)
+    mock_client.create_tensorboard_time_series = mock.AsyncMock(
+        side_effect=create_tensorboard_time_series
+    )
+    mock_client.list_tensorboard_runs = mock.AsyncMock(
+        side_effect=lambda **kwargs: _async_pager([])
+    )
+    mock_client.list_tensorboard_time_series = mock.AsyncMock(
+        side_effect=lambda **kwargs: _async_pager([])
+    )
+    return mock_client
+
+
+class AsyncOnePlatformResourceManagerTest(tf.test.TestCase):
+    def test_get_run_resource_name_creates_run_once(self):
+        mock_client = _create_mock_async_client()
+        manager = uploader_utils.AsyncOnePlatformResourceManager(
+            _TEST_ONE_PLATFORM_EXPERIMENT_NAME, mock_client
+        )
+
+        async def get_run_resource_names():
+            return await asyncio.gather(
+                *[manager.get_run_resource_name(_TEST_RUN_NAME) for _ in range(3)]
+            )
+
+        run_resource_names = _run_coroutine(get_run_resource_names())
+
+        self.assertLen(set(run_resource_names), 1)
+        mock_client.list_tensorboard_runs.assert_called_once()
+        mock_client.create_tensorboard_run.assert_called_once()
+
+    def test_get_run_resource_name_creates_runs_concurrently(self):
+        mock_client = _create_mock_async_client()
+        create_run_response = mock_client.create_tensorboard_run.side_effect
+        manager = uploader_utils.AsyncOnePlatformResourceManager(
+            _TEST_ONE_PLATFORM_EXPERIMENT_NAME, mock_client
+        )
+        run_names = ["run-{}".format(i) for i in range(5)]
+
+        async def get_run_resource_names():
+            all_started = asyncio.Event()
+            started = []
+
+            async def create_run(**kwargs):
+                # Every create waits for all of them to start, so this only
+                # finishes if the runs are created concurrently.
+                started.append(kwargs)
+                if len(started) == len(run_names):
+                    all_started.set()
+                await asyncio.wait_for(all_started.wait(), timeout=5)
+                return create_run_response(**kwargs)
+
+            mock_client.create_tensorboard_run.side_effect = create_run
+            return await asyncio.gather(
+                *[manager.get_run_resource_name(run_name) for run_name in run_names]
+            )
+
+        run_resource_names = _run_coroutine(get_run_resource_names())
+
+        self.assertLen(set(run_resource_names), 5)
+        mock_client.list_tensorboard_runs.assert_called_once()
+
+    def test_bulk_get_time_series_resource_names(self):
+        mock_client = _create_mock_async_client()
+        existing_time_series = [
+            tensorboard_time_series_type.TensorboardTimeSeries(
+                name=_TEST_ONE_PLATFORM_TIME_SERIES_NAME,
+                display_name=_TEST_TIME_SERIES_NAME,
+            )
+        ]
+        mock_client.list_tensorboard_runs.side_effect = lambda **kwargs: (
+            _async_pager(
+                [
+                    tensorboard_run_type.TensorboardRun(
+                        name=_TEST_ONE_PLATFORM_RUN_NAME, display_name=_TEST_RUN_NAME
+                    )
+                ]
+            )
+        )
+        mock_client.list_tensorboard_time_series.side_effect = lambda **kwargs: (
+            _async_pager(existing_time_series)
+        )
+        manager = uploader_utils.AsyncOnePlatformResourceManager(
+            _TEST_ONE_PLATFORM_EXPERIMENT_NAME, mock_client
+        )
+        creator = tensorboard_time_series_type.TensorboardTimeSeries
+        tags = [_TEST_TIME_SERIES_NAME, "tag-1", "tag-2"]
+
+        time_series_names = _run_coroutine(
+            manager.bulk_get_time_series_resource_names(
+                _TEST_RUN_NAME, [(tag, creator) for tag in tags]
+            )
+        )
+
+        self.assertEqual(
+            _TEST_ONE_PLATFORM_TIME_SERIES_NAME,
+            time_series_names[_TEST_TIME_SERIES_NAME],
+        )
+        self.assertTrue(time_series_names["tag-1"].endswith("/timeSeries/tag-1"))
+        self.assertEqual(2, mock_client.create_tensorboard_time_series.call_count)
+
+    def test_concurrent_requests_create_time_series_once(self):
+        mock_client = _create_mock_async_client()
+        manager = uploader_utils.AsyncOnePlatformResourceManager(
+            _TEST_ONE_PLATFORM_EXPERIMENT_NAME, mock_client
+        )
+        creator = tensorboard_time_series_type.TensorboardTimeSeries
+
+        async def get_time_series_names():
+            return await asyncio.gather(
+                manager.bulk_get_time_series_resource_names(
+                    _TEST_RUN_NAME, [(_TEST_TIME_SERIES_NAME, creator)]
+                ),
+                manager.get_time_series_resource_name(
+                    _TEST_RUN_NAME, _TEST_TIME_SERIES_NAME, creator
+                ),
+            )
+
+        bulk_names, time_series_name = _run_coroutine(get_time_series_names())
+
+        self.assertEqual(bulk_names[_TEST_TIME_SERIES_NAME], time_series_name)
+        mock_client.create_tensorboard_time_series.assert_called_once()
+
+    def test_manager_can_be_reused_across_event_loops(self):
+        mock_client = _create_mock_async_client()
+        manager = uploader_utils.AsyncOnePlatformResourceManager(
+            _TEST_ONE_PLATFORM_EXPERIMENT_NAME, mock_client
+        )
+        creator = tensorboard_time_series_type.TensorboardTimeSeries
+
+        _run_coroutine(manager.get_run_resource_name(_TEST_RUN_NAME))
+        _run_coroutine(manager.get_run_resource_name("other-run"))
+        time_series_name = _run_coroutine(
+            manager.get_time_series_resource_name(
+                "other-run", _TEST_TIME_SERIES_NAME, creator
+            )
+        )
+
+        self.assertTrue(
+            time_series_name.endswith("/timeSeries/" + _TEST_TIME_SERIES_NAME)
+        )
+        self.assertEqual(2, mock_client.create_tensorboard_run.call_count)
+
+    def test_get_time_series_resource_name_already_exists(self):
+        mock_client = _create_mock_async_client()
+        mock_client.create_tensorboard_time_series.side_effect = exceptions.InvalidArgument(
+            "Time series already exist"
+        )
+        existing = tensorboard_time_series_type.TensorboardTimeSeries(
+            name=_TEST_ONE_PLATFORM_TIME_SERIES_NAME,
+            display_name=_TEST_TIME_SERIES_NAME,
+        )
+        # The server may return an empty first page and the match on a later
+        # one. The run is created by the manager, so the only list call is
+        # the display name lookup.
+        next_page = mock.AsyncMock(
+            return_value=tensorboard_service_type.ListTensorboardTimeSeriesResponse(
+                tensorboard_time_series=[existing]
+            )
+        )
+        mock_client.list_tensorboard_time_series.side_effect = None
+        mock_client.list_tensorboard_time_series.return_value = pagers.ListTensorboardTimeSeriesAsyncPager(
+            next_page,
+            tensorboard_service_type.ListTensorboardTimeSeriesRequest(),
+            tensorboard_service_type.ListTensorboardTimeSeriesResponse(
+                next_page_token="page-2"
+            ),
+        )
+        manager = uploader_utils.AsyncOnePlatformResourceManager(
+            _TEST_ONE_PLATFORM_EXPERIMENT_NAME, mock_client
+        )
+        creator = tensorboard_time_series_type.TensorboardTimeSeries
+
+        time_series_name = _run_coroutine(
+            manager.get_time_series_resource_name(
+                _TEST_RUN_NAME, _TEST_TIME_SERIES_NAME, creator
+            )
+        )
+
+        self.assertEqual(_TEST_ONE_PLATFORM_TIME_SERIES_NAME, time_series_name)
+        next_page.assert_called_once()
+
+
+class TimeSeriesResourceManagerTest(tf.test.TestCase):
+    def _create_manager_with_existing_time_series(self, existing_time_series):
+        mock_client = _create_mock_client()
+        mock_client.create_tensorboard_time_series.side_effect = exceptions.InvalidArgument(
+            "Time series already exist"
+        )
+        # The first list call warms the cache before the create is attempted.
+        mock_client.list_tensorboard_time_series.side_effect = [
+            [],
+            existing_time_series,
+        ]
+        manager = uploader_utils.TimeSeriesResourceManager(
+            _TEST_ONE_PLATFORM_RUN_NAME, mock_client
+        )
+        return manager, mock_client
+
+    def test_get_or_create_prefetches_existing_time_series(self):
+        mock_client = _create_mock_client()
+        mock_client.list_tensorboard_time_series.return_value = [
+            tensorboard_time_series_type.TensorboardTimeSeries(
+                name=_TEST_ONE_PLATFORM_TIME_SERIES_NAME,
+                display_name=_TEST_TIME_SERIES_NAME,
+            ),
+        ]
+        manager = uploader_utils.TimeSeriesResourceManager(
+            _TEST_ONE_PLATFORM_RUN_NAME, mock_client
+        )
+        creator = tensorboard_time_series_type.TensorboardTimeSeries
+
+        time_series = manager.get_or_create(_TEST_TIME_SERIES_NAME, creator)
+        manager.get_or_create("new-tag", creator)
+
+        self.assertEqual(_TEST_ONE_PLATFORM_TIME_SERIES_NAME, time_series.name)
+        mock_client.list_tensorboard_time_series.assert_called_once_with(
+            request=tensorboard_service_type.ListTensorboardTimeSeriesRequest(
+                parent=_TEST_ONE_PLATFORM_RUN_NAME
+            )
+        )
+        mock_client.create_tensorboard_time_series.assert_called_once()
+
+    def test_get_or_create_prefetch_skips_duplicates(self):
+        duplicates = [
+            tensorboard_time_series_type.TensorboardTimeSeries(
+                name="{}-{}".format(_TEST_ONE_PLATFORM_TIME_SERIES_NAME, i),
+                display_name=_TEST_TIME_SERIES_NAME,
+            )
+            for i in range(2)
+        ]
+        manager, mock_client = self._create_manager_with_existing_time_series(
+            duplicates
+        )
+        mock_client.list_tensorboard_time_series.side_effect = None
+        mock_client.list_tensorboard_time_series.return_value = duplicates
+
+        with self.assertRaises(ValueError):
+            manager.get_or_create(
+                _TEST_TIME_SERIES_NAME,
+                tensorboard_time_series_type.TensorboardTimeSeries,
+            )
+        mock_client.create_tensorboard_time_series.assert_called_once()
+
+    def test_get_or_create_already_exists(self):
+        existing = tensorboard_time_series_type.TensorboardTimeSeries(
+            name=_TEST_ONE_PLATFORM_TIME_SERIES_NAME,
+            display_name=_TEST_TIME_SERIES_NAME,
+        )
+        manager, mock_client = self._create_manager_with_existing_time_series(
+            [existing]
+        )
+
+        time_series = manager.get_or_create(
+            _TEST_TIME_SERIES_NAME, tensorboard_time_series_type.TensorboardTimeSeries,
+        )
+
+        self.assertEqual(_TEST_ONE_PLATFORM_TIME_SERIES_NAME, time_series.name)
+        request = mock_client.list_tensorboard_time_series.call_args[1]["request"]
+        self.assertEqual(2, request.page_size)
+
+    def test_get_or_create_already_exists_duplicates(self):
+        manager, _ = self._create_manager_with_existing_time_series(
+            [
+                tensorboard_time_series_type.TensorboardTimeSeries(
+                    display_name=_TEST_TIME_SERIES_NAME
+                )
+            ]
+            * 3
+        )
+
+        with self.assertRaises(ValueError):
+            manager.get_or_create(
+                _TEST_TIME_SERIES_NAME,
+                tensorboard_time_series_type.TensorboardTimeSeries,
+            )
+
+    def test_get_or_create_already_exists_not_found(self):
+        manager, _ = self._create_manager_with_existing_time_series([])
+
+        with self.assertRaises(uploader_utils.ExistingResourceNotFoundError):
+            manager.get_or_create(
+                _TEST_TIME_SERIES_NAME,
+                tensorboard_time_series_type.TensorboardTimeSeries,
+            )
+
+
+class GetSourceBucketTest(tf.test.TestCase):
+    def test_local_logdir_returns_none(self):
+        self.assertIsNone(uploader_utils.get_source_bucket(_TEST_LOG_DIR_NAME))
+
+    def test_gcs_logdir_reuses_storage_client(self):
+        with mock.patch.object(uploader_utils, "_storage_client", None), mock.patch(
+            "google.cloud.storage.Client"
+        ) as storage_client_mock:
+            uploader_utils.get_source_bucket("gs://my-bucket/logs")
+            uploader_utils.get_source_bucket("gs://my-bucket")
+
+        storage_client_mock.assert_called_once()
+        storage_client_mock.return_value.bucket.assert_has_calls(
+            [mock.call("my-bucket"), mock.call("my-bucket")]
+        )
+
+    def test_storage_client_mounts_pooled_adapter(self):
+        with mock.patch.object(uploader_utils, "_storage_client", None), mock.patch(
+            "google.cloud.storage.Client"
+        ) as storage_client_mock:
+            uploader_utils.get_source_bucket("gs://my-bucket/logs")
+            uploader_utils.get_source_bucket("gs://my-bucket/logs")
+
+        mount_mock = storage_client_mock.return_value._http.mount
+        mount_mock.assert_called_once()
+        prefix, adapter = mount_mock.call_args[0]
+        self.assertEqual("https://", prefix)
+        self.assertIsInstance(adapter, adapters.HTTPAdapter)
+        self.assertEqual(
+            uploader_utils._STORAGE_POOL_CONNECTIONS, adapter._pool_connections
+        )
+        self.assertEqual(uploader_utils._STORAGE_POOL_MAXSIZE, adapter._pool_maxsize)
+        self.assertEqual(3, adapter.max_retries.total)
+
+
+class RequestLoggerTest(tf.test.TestCase):
+    def test_skips_request_size_when_info_disabled(self):
+        request = mock.Mock()
+        with mock.patch.object(
+            uploader_utils.logger, "isEnabledFor", return_value=False
+        ):
+            with uploader_utils.request_logger(request):
+                pass
+
+        request._pb.ByteSize.assert_not_called()
+
+    def test_logs_request_size_when_info_enabled(self):
+        request = mock.Mock()
+        request._pb.ByteSize.return_value = 123
+        with self.assertLogs(uploader_utils.logger, logging.INFO) as logs:
+            with uploader_utils.request_logger(request):
+                pass
+
+        request._pb.ByteSize.assert_called_once()
+        self.assertIn("Trying request of 123 bytes", logs.output[0])
+
+
+class BatchingWriterTest(tf.test.TestCase):
+    def _create_request(self, time_series_id, num_values=1):
+        return tensorboard_service_type.WriteTensorboardRunDataRequest(
+            time_series_data=[
+                tensorboard_data.TimeSeriesData(
+                    tensorboard_time_series_id=time_series_id,
+                    values=[
+                        tensorboard_data.TimeSeriesDataPoint(step=step)
+                        for step in range(num_values)
+                    ],
+                )
+            ]
+        )
+
+    def test_add_batches_until_flush(self):
+        mock_client = _create_mock_client()
+        writer = uploader_utils.BatchingWriter(
+            api=mock_client, run_resource_name=_TEST_ONE_PLATFORM_RUN_NAME
+        )
+
+        writer.add(self._create_request("ts-1"))
+        writer.add(self._create_request("ts-2"))
+        writer.add(self._create_request("ts-1"))
+        mock_client.write_tensorboard_run_data.assert_not_called()
+        writer.flush()
+        writer.flush()
+
+        mock_client.write_tensorboard_run_data.assert_called_once()
+        call_args = mock_client.write_tensorboard_run_data.call_args[1]
+        self.assertEqual(_TEST_ONE_PLATFORM_RUN_NAME, call_args["tensorboard_run"])
+        self.assertEqual(
+            {"ts-1": 2, "ts-2": 1},
+            _extract_tag_counts_time_series(
+                mock_client.write_tensorboard_run_data.call_args_list
+            ),
+        )
+
+    def test_add_flushes_before_exceeding_request_size(self):
+        mock_client = _create_mock_client()
+        request = self._create_request("ts-1", num_values=10)
+        writer = uploader_utils.BatchingWriter(
+            api=mock_client,
+            run_resource_name=_TEST_ONE_PLATFORM_RUN_NAME,
+            max_request_size=int(request._pb.ByteSize() * 1.5),
+        )
+
+        writer.add(request)
+        writer.add(self._create_request("ts-1", num_values=10))
+        mock_client.write_tensorboard_run_data.assert_called_once()
+        writer.flush()
+
+        self.assertEqual(2, mock_client.write_tensorboard_run_data.call_count)
+
+    def test_flush_keeps_failed_requests_for_next_flush(self):
+        mock_client = _create_mock_client()
+        request = self._create_request("ts-1", num_values=10)
+        writer = uploader_utils.BatchingWriter(
+            api=mock_client,
+            run_resource_name=_TEST_ONE_PLATFORM_RUN_NAME,
+            max_request_size=int(request._pb.ByteSize() * 1.5),
+        )
+        mock_client.write_tensorboard_run_data.side_effect = exceptions.ServiceUnavailable(
+            "Try again"
+        )
+
+        writer.add(request)
+        writer.add(self._create_request("ts-2", num_values=10))
+        writer.flush()
+        self.assertEqual(2, mock_client.write_tensorboard_run_data.call_count)
+
+        mock_client.write_tensorboard_run_data.side_effect = None
+        mock_client.write_tensorboard_run_data.reset_mock()
+        writer.flush()
+        writer.flush()
+
+        self.assertEqual(
+            [["ts-1"], ["ts-2"]],
+            [
+                [
+                    data.tensorboard_time_series_id
+                    for data in call[1]["time_series_data"]
+                ]
+                for call in mock_client.write_tensorboard_run_data.call_args_list
+            ],
+        )
+
+    def test_add_flushes_after_max_delay(self):
+        mock_client = _create_mock_client()
+        writer = uploader_utils.BatchingWriter(
+            api=mock_client,
+            run_resource_name=_TEST_ONE_PLATFORM_RUN_NAME,
+            max_delay_secs=0,
+        )
+
+        writer.add(self._create_request("ts-1"))
+        writer.add(self._create_request("ts-2"))
+
+        mock_client.write_tensorboard_run_data.assert_called_once()
+
+    @mock.patch.object(uploader_utils.time, "monotonic", autospec=True)
+    def test_add_without_max_delay_waits_for_flush(self, mock_monotonic):
+        mock_monotonic.side_effect = itertools.count(step=100)
+        mock_client = _create_mock_client()
+        writer = uploader_utils.BatchingWriter(
+            api=mock_client,
+            run_resource_name=_TEST_ONE_PLATFORM_RUN_NAME,
+            max_delay_secs=None,
+        )
+
+        writer.add(self._create_request("ts-1"))
+        writer.add(self._create_request("ts-2"))
+        mock_client.write_tensorboard_run_data.assert_not_called()
+        writer.flush()
+
+        mock_client.write_tensorboard_run_data.assert_called_once()
+
+
+class MakeTensorboardClientTest(tf.test.TestCase):
+    def test_channel_has_keepalive_options(self):
+        test_channel = grpc_testing.channel(
+            service_descriptors=[], time=grpc_testing.strict_real_time()
+        )
+        with mock.patch.object(
+            transports_grpc.TensorboardServiceGrpcTransport,
+            "create_channel",
+            return_value=test_channel,
+        ) as create_channel_mock:
+            client = uploader_utils.make_tensorboard_client(
+                "us-central1-aiplatform.googleapis.com"
+            )
+
+        self.assertIs(test_channel, client._transport.grpc_channel)
+        options = dict(create_channel_mock.call_args[1]["options"])
+        self.assertEqual(30000, options["grpc.keepalive_time_ms"])
+        self.assertEqual(10000, options["grpc.keepalive_timeout_ms"])
+        self.assertEqual(0, options["grpc.http2.max_pings_without_data"])
+
+
 class VarintCostTest(tf.test.TestCase):
     def test_varint_cost(self):
         self.assertEqual(uploader_lib._varint_cost(0), 1)